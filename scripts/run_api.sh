@@ -10,4 +10,10 @@ source venv/bin/activate
 export PYTHONPATH="${PYTHONPATH}:$(pwd)"
 
 # Run the FastAPI server from project root
-python -m uvicorn src.app.api:app --host 0.0.0.0 --port 8000 --reload 
\ No newline at end of file
+# Set API_RELOAD=1 for single-worker auto-reload during development
+if [ "${API_RELOAD:-0}" = "1" ]; then
+    python -m uvicorn src.app.api:app --host 0.0.0.0 --port 8000 --reload
+else
+    python -m uvicorn src.app.api:app --host 0.0.0.0 --port 8000 \
+        --workers "${WEB_CONCURRENCY:-4}" --loop uvloop --http httptools --no-access-log
+fi 
\ No newline at end of file
@@ -5,5 +5,8 @@ if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
+# Make the project root importable for the app's absolute src.* imports
+export PYTHONPATH="${PYTHONPATH}:$(pwd)"
+
 # Run the Streamlit app
 streamlit run src/ui/app.py 
\ No newline at end of file
@@ -1,9 +1,16 @@
-from fastapi import FastAPI, HTTPException, status, UploadFile, File, Form, Query, Body
+from fastapi import FastAPI, HTTPException, status, UploadFile, File, Form, Query, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 from typing import List, Optional
+from functools import partial, wraps
+import anyio.to_thread
+import asyncio
 import logging
-from src.core.rag_engine import main as rag_main
+import time
+from src.core.rag_engine import main as rag_main, main_stream as rag_main_stream, list_collections as _list_collections
+from src.core.semantic_cache import semantic_cache
 from src.core.document_service import document_service
 from src.core.database import db_manager
 from src.ingestion.ingest import process_single_document
@@ -13,12 +20,67 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
+# ORJSONResponse serializes responses with orjson (C implementation) instead of
+# the default jsonable_encoder + json.dumps pipeline, which dominates CPU time
+# on small response-heavy endpoints like /chat and /health.
 app = FastAPI(
     title="QnA Bot API",
     description="API for document-based question answering",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Vector-store indexing queue: /documents/{id}/process enqueues and returns
+# immediately; a single background consumer drains the queue in batches so
+# clients never wait on chunking + embedding + Chroma writes
+_process_queue: "asyncio.Queue" = asyncio.Queue()
+_PROCESS_BATCH_SIZE = 16
+_PROCESS_BATCH_WINDOW = 0.1  # seconds to wait for more work before flushing
+# Strong reference to the consumer task: the event loop only keeps a weak
+# one, so without this the worker can be garbage-collected mid-flight
+_process_queue_task: "asyncio.Task" = None
+
+async def _process_queue_worker():
+    """Drain the processing queue, batching documents where possible."""
+    while True:
+        batch = [await _process_queue.get()]
+        while len(batch) < _PROCESS_BATCH_SIZE:
+            try:
+                batch.append(await asyncio.wait_for(
+                    _process_queue.get(), timeout=_PROCESS_BATCH_WINDOW
+                ))
+            except asyncio.TimeoutError:
+                break
+        for file_path, document_id in batch:
+            try:
+                result = await anyio.to_thread.run_sync(
+                    process_single_document, file_path, document_id
+                )
+                logger.info("Background processing of document %s: %s",
+                            document_id, result["status"])
+            except Exception as e:
+                logger.error("Background processing of document %s failed: %s",
+                             document_id, str(e))
+            finally:
+                _process_queue.task_done()
+
+@app.on_event("startup")
+async def configure_thread_pool():
+    """Allow enough worker threads for concurrent RAG calls."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 64
+
+@app.on_event("startup")
+async def start_process_queue_worker():
+    """Start the background consumer for document processing."""
+    global _process_queue_task
+    _process_queue_task = asyncio.create_task(_process_queue_worker())
+
+@app.on_event("shutdown")
+async def stop_process_queue_worker():
+    """Cancel the background consumer so shutdown doesn't strand it."""
+    if _process_queue_task is not None:
+        _process_queue_task.cancel()
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,11 +90,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def http_safe(fn):
+    """Shared endpoint error handling: re-raise HTTPExceptions, convert
+    anything else into a logged 500. Replaces the identical try/except
+    boilerplate that every handler used to carry."""
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("Unexpected error in %s", fn.__name__, exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+    return wrapper
+
 # Pydantic models for request/response
+# Request models are strict (extra="forbid") and built eagerly so the Rust
+# validator is ready before the first request
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True,
+                              defer_build=False, hide_input_in_errors=True)
+
     question: str = Field(..., min_length=1, max_length=1000, description="The question to ask")
     collection_name: Optional[str] = Field(default="documents", description="ChromaDB collection name")
 
+# Pre-built adapter reused by the /chat hot path to parse the raw body
+# without going through FastAPI's dependency-injection machinery
+_CHAT_ADAPTER = TypeAdapter(ChatRequest)
+
 class ChatResponse(BaseModel):
     answer: str
     status: str
@@ -51,10 +140,19 @@ class DocumentResponse(BaseModel):
     message: Optional[str] = None
 
 class DocumentUpdateRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True,
+                              defer_build=False, hide_input_in_errors=True)
+
     title: Optional[str] = None
     description: Optional[str] = None
     area: Optional[str] = None
 
+# Warm the validator/serializer schemas at import so the first request
+# doesn't pay the cold-start schema build
+for _model in (ChatRequest, ChatResponse, HealthResponse,
+               DocumentResponse, DocumentUpdateRequest):
+    _model.model_rebuild()
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Health check endpoint."""
@@ -71,81 +169,141 @@ async def health_check():
         message="QnA Bot API is running"
     )
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+@app.post("/chat",
+          responses={200: {"model": ChatResponse}},
+          openapi_extra={"requestBody": {"content": {"application/json": {
+              "schema": ChatRequest.model_json_schema()}}, "required": True}})
+@http_safe
+async def chat(request: Request):
     """
     Process a question and return an answer based on the document knowledge base.
-    
+
+    The body is parsed with a pre-built TypeAdapter instead of FastAPI's
+    dependency-injection path to keep per-request overhead down.
+
     Args:
-        request: ChatRequest containing the question and optional collection name
-        
+        request: Raw request whose JSON body matches ChatRequest
+
     Returns:
-        ChatResponse with the answer, status, and sources
+        ORJSONResponse with the answer, status, and sources
     """
     try:
-        logger.info(f"Processing chat request: {request.question[:100]}...")
-        
-        # Validate input
-        if not request.question.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Question cannot be empty"
-            )
-        
-        # Process the question using the RAG engine
-        result = rag_main(request.question)
-        
-        logger.info(f"RAG processing completed with status: {result['status']}")
-        
-        if result["status"] == "success":
-            return ChatResponse(
-                answer=result["answer"],
-                status="success",
-                sources=result.get("sources", [])
-            )
-        else:
-            # RAG engine returned an error
-            return ChatResponse(
-                answer="",
-                status="error",
-                sources=[],
-                error_message=result["answer"]
-            )
-            
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in chat endpoint: {str(e)}")
+        chat_request = _CHAT_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_input=False)
         )
 
+    logger.info("Processing chat request: %s...", chat_request.question[:100])
+
+    # Validate input
+    if not chat_request.question.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Question cannot be empty"
+        )
+
+    # Process the question using the RAG engine off the event loop so a
+    # long RAG call doesn't block other requests on this worker. The
+    # semantic cache short-circuits repeat/paraphrased questions without
+    # re-running retrieval or the LLM call.
+    result = await anyio.to_thread.run_sync(
+        semantic_cache.get_or_compute, chat_request.question, rag_main
+    )
+
+    logger.info("RAG processing completed with status: %s", result['status'])
+
+    # Build the response dict directly and serialize with orjson; skipping
+    # the response_model round-trip avoids re-validating the payload.
+    if result["status"] == "success":
+        return ORJSONResponse({
+            "answer": result["answer"],
+            "status": "success",
+            "sources": result.get("sources", []),
+            "error_message": None
+        })
+    else:
+        # RAG engine returned an error
+        return ORJSONResponse({
+            "answer": "",
+            "status": "error",
+            "sources": [],
+            "error_message": result["answer"]
+        })
+
+@app.post("/chat/stream",
+          openapi_extra={"requestBody": {"content": {"application/json": {
+              "schema": ChatRequest.model_json_schema()}}, "required": True}})
+@http_safe
+async def chat_stream(request: Request):
+    """
+    Stream an answer for a question as plain-text deltas.
+
+    Bypasses the semantic cache (it stores whole responses) so first-token
+    latency is bounded by retrieval plus model prefill instead of the full
+    completion.
+
+    Args:
+        request: Raw request whose JSON body matches ChatRequest
+
+    Returns:
+        StreamingResponse yielding the answer text incrementally
+    """
+    try:
+        chat_request = _CHAT_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_input=False)
+        )
+
+    if not chat_request.question.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Question cannot be empty"
+        )
+
+    logger.info("Processing streaming chat request: %s...", chat_request.question[:100])
+    return StreamingResponse(rag_main_stream(chat_request.question),
+                             media_type="text/plain; charset=utf-8")
+
+# Collections change rarely but dashboards poll /collections frequently;
+# cache the result briefly and invalidate on document writes
+_COLLECTIONS_CACHE_TTL = 30.0
+_collections_cache = {}
+
+def _invalidate_collections_cache():
+    """Drop the cached /collections result after a document write."""
+    _collections_cache.pop("collections", None)
+
 @app.get("/collections")
+@http_safe
 async def list_collections():
     """
     List available ChromaDB collections.
-    
+
+    Results are cached for a short TTL so back-to-back dashboard polls
+    don't open a ChromaDB client each time.
+
     Returns:
         List of collection names
     """
-    try:
-        from src.core.rag_engine import list_collections
-        collections = list_collections()
-        return {
-            "collections": [col.name for col in collections],
-            "count": len(collections)
-        }
-    except Exception as e:
-        logger.error(f"Error listing collections: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error listing collections: {str(e)}"
-        )
+    cached = _collections_cache.get("collections")
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    collections = await anyio.to_thread.run_sync(_list_collections)
+    result = {
+        "collections": [col.name for col in collections],
+        "count": len(collections)
+    }
+    _collections_cache["collections"] = (result, time.monotonic() + _COLLECTIONS_CACHE_TTL)
+    return result
 
 # Document Management Endpoints
-@app.post("/documents/upload", response_model=DocumentResponse)
+@app.post("/documents/upload", responses={200: {"model": DocumentResponse}})
+@http_safe
 async def upload_document(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
@@ -164,31 +322,24 @@ async def upload_document(
     Returns:
         DocumentResponse with upload status and document info
     """
-    try:
-        # Change: Make Title a required field for document upload (Test 3b)
-        if not title or title.strip() == "":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Title is required for document upload."
-            )
-        logger.info(f"Processing document upload: {file.filename}")
-        result = await document_service.upload_document(
-            file=file,
-            title=title,
-            description=description,
-            area=area
-        )
-        return DocumentResponse(**result)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in upload_document: {str(e)}")
+    # Change: Make Title a required field for document upload (Test 3b)
+    if not title or title.strip() == "":
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Title is required for document upload."
         )
+    logger.info("Processing document upload: %s", file.filename)
+    result = await document_service.upload_document(
+        file=file,
+        title=title,
+        description=description,
+        area=area
+    )
+    _invalidate_collections_cache()
+    return DocumentResponse.model_construct(**result)
 
-@app.get("/documents", response_model=DocumentResponse)
+@app.get("/documents", responses={200: {"model": DocumentResponse}})
+@http_safe
 async def list_documents(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
@@ -205,25 +356,46 @@ async def list_documents(
     Returns:
         DocumentResponse with list of documents and stats
     """
-    try:
-        result = document_service.list_documents(
-            limit=limit,
-            offset=offset,
-            area=area
-        )
-        
-        return DocumentResponse(**result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in list_documents: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
-        )
+    result = await anyio.to_thread.run_sync(
+        partial(document_service.list_documents, limit=limit, offset=offset, area=area)
+    )
+
+    return ORJSONResponse(content=result)
+
+@app.get("/documents/stream")
+async def stream_documents(
+    limit: int = Query(1000, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+    area: Optional[str] = Query(None)
+):
+    """
+    Stream documents as a JSON array without buffering the full result set.
+
+    Rows come from a server-side cursor and are serialized one at a time,
+    so peak memory stays constant regardless of how many documents match.
+
+    Args:
+        limit: Maximum number of documents to return
+        offset: Number of documents to skip
+        area: Optional filter by area/category
 
-@app.get("/documents/stats", response_model=DocumentResponse)
+    Returns:
+        StreamingResponse with a JSON array of documents
+    """
+    def generate():
+        yield b'['
+        first = True
+        for row in db_manager.iter_documents(limit=limit, offset=offset, area=area):
+            if not first:
+                yield b','
+            yield orjson.dumps(row)
+            first = False
+        yield b']'
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+@app.get("/documents/stats", responses={200: {"model": DocumentResponse}})
+@http_safe
 async def get_document_stats():
     """
     Get document statistics.
@@ -231,20 +403,11 @@ async def get_document_stats():
     Returns:
         DocumentResponse with document statistics
     """
-    try:
-        result = document_service.get_document_stats()
-        return DocumentResponse(**result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_document_stats: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
-        )
+    result = await anyio.to_thread.run_sync(document_service.get_document_stats)
+    return DocumentResponse.model_construct(**result)
 
-@app.get("/documents/{document_id}", response_model=DocumentResponse)
+@app.get("/documents/{document_id}", responses={200: {"model": DocumentResponse}})
+@http_safe
 async def get_document(document_id: int):
     """
     Get a specific document by ID.
@@ -255,20 +418,11 @@ async def get_document(document_id: int):
     Returns:
         DocumentResponse with document details
     """
-    try:
-        result = document_service.get_document(document_id)
-        return DocumentResponse(**result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_document: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
-        )
+    result = await anyio.to_thread.run_sync(document_service.get_document, document_id)
+    return ORJSONResponse(content=result)
 
-@app.delete("/documents/{document_id}", response_model=DocumentResponse)
+@app.delete("/documents/{document_id}", responses={200: {"model": DocumentResponse}})
+@http_safe
 async def delete_document(document_id: int):
     """
     Delete a document (soft delete).
@@ -279,20 +433,12 @@ async def delete_document(document_id: int):
     Returns:
         DocumentResponse with deletion status
     """
-    try:
-        result = document_service.delete_document(document_id)
-        return DocumentResponse(**result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in delete_document: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
-        )
+    result = await anyio.to_thread.run_sync(document_service.delete_document, document_id)
+    _invalidate_collections_cache()
+    return DocumentResponse.model_construct(**result)
 
-@app.post("/documents/{document_id}/process", response_model=DocumentResponse)
+@app.post("/documents/{document_id}/process", responses={200: {"model": DocumentResponse}})
+@http_safe
 async def process_document(document_id: int):
     """
     Process a document for vector store indexing.
@@ -303,34 +449,29 @@ async def process_document(document_id: int):
     Returns:
         DocumentResponse with processing status
     """
-    try:
-        # Get document details
-        document = db_manager.get_document(document_id)
-        if not document:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document with ID {document_id} not found"
-            )
-        
-        # Process document for vector store
-        processing_result = process_single_document(document["file_path"], document_id)
-        
-        return DocumentResponse(
-            status=processing_result["status"],
-            message=processing_result["message"],
-            document=document
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in process_document: {str(e)}")
+    # Get document details
+    document = await anyio.to_thread.run_sync(db_manager.get_document, document_id)
+    if not document:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document with ID {document_id} not found"
         )
 
-@app.put("/documents/{document_id}", response_model=DocumentResponse)
+    # Enqueue for the background worker instead of blocking the client
+    # on chunking + embedding + Chroma writes
+    await _process_queue.put((document["file_path"], document_id))
+
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "status": "queued",
+            "message": f"Document {document_id} queued for processing",
+            "document": document
+        }
+    )
+
+@app.put("/documents/{document_id}", responses={200: {"model": DocumentResponse}})
+@http_safe
 async def update_document(
     document_id: int,
     update: DocumentUpdateRequest = Body(...)
@@ -338,44 +479,59 @@ async def update_document(
     """
     Update document metadata (title, description, area).
     """
-    try:
-        result = document_service.update_document(
+    result = await anyio.to_thread.run_sync(
+        partial(
+            document_service.update_document,
             document_id=document_id,
             title=update.title,
             description=update.description,
             area=update.area
         )
-        return DocumentResponse(**result)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in update_document: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
-        )
+    )
+    return DocumentResponse.model_construct(**result)
 
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions."""
-    logger.error(f"HTTP error {exc.status_code}: {exc.detail}")
-    return {
-        "status": "error",
-        "error_code": exc.status_code,
-        "error_message": exc.detail
-    }
+    logger.error("HTTP error %s: %s", exc.status_code, exc.detail)
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={
+            "status": "error",
+            "error_code": exc.status_code,
+            "error_message": exc.detail
+        }
+    )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions."""
-    logger.error(f"Unexpected error: {str(exc)}")
-    return {
-        "status": "error",
-        "error_code": 500,
-        "error_message": "Internal server error"
-    }
+    logger.error("Unexpected error: %s", str(exc))
+    return ORJSONResponse(
+        status_code=500,
+        content={
+            "status": "error",
+            "error_code": 500,
+            "error_message": "Internal server error"
+        }
+    )
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    from src.core.config import settings
+
+    # Multiple workers sidestep the GIL for CPU-heavy RAG calls; uvloop and
+    # httptools replace the stock asyncio loop and h11 parser. Workers need
+    # the import string (not the app object) to fork, and each one builds
+    # its own Chroma/OpenAI clients in the startup hooks.
+    uvicorn.run(
+        "src.app.api:app",
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        workers=int(os.getenv("WEB_CONCURRENCY", "4")),
+        loop="uvloop",
+        http="httptools",
+        access_log=False
+    ) 
\ No newline at end of file
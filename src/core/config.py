@@ -1,5 +1,4 @@
 from pydantic_settings import BaseSettings
-from functools import lru_cache
 from typing import Optional
 
 class Settings(BaseSettings):
@@ -8,6 +7,16 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     OPENAI_API_KEY: str
     OPENAI_MODEL_NAME: str = "gpt-4.1-nano"
+    # Route concurrent chat completions through aiohttp; the SDK's default
+    # httpx transport degrades past ~10 in-flight requests
+    OPENAI_USE_AIOHTTP: bool = True
+    # Client-side pacing for async completions, sized to the account's
+    # rate limits; 0 disables the bucket entirely
+    OPENAI_RPM: int = 500
+    OPENAI_TPM: int = 200_000
+    # Route offline evaluation (__main__ test queries) through the Batch
+    # API: half the cost and separate rate limits, at 24h turnaround
+    USE_BATCH_API: bool = False
     
     # Application Configuration
     APP_ENV: str = "development"
@@ -15,9 +24,43 @@ class Settings(BaseSettings):
     
     # Vector Store Configuration
     CHROMA_PERSIST_DIRECTORY: str = "./data/chroma"
+    # "chroma" (default) or "faiss"; FAISS avoids Chroma's super-linear
+    # insert cost on write-heavy ingestion and needs faiss-cpu installed
+    VECTOR_BACKEND: str = "chroma"
+    FAISS_PERSIST_DIRECTORY: str = "./data/faiss"
+    # Retrieval behavior: minimum similarity for a chunk to count, how
+    # many chunks to fetch per query, and whether answers cite sources
+    RELEVANCE_THRESHOLD: float = 0.3
+    N_RESULTS: int = 5
+    CITE_SOURCES: bool = True
+    # HNSW shape for newly created Chroma collections: search_ef trades
+    # query latency for recall, M trades index size for graph quality.
+    # Existing collections keep the parameters they were created with.
+    HNSW_M: int = 16
+    HNSW_CONSTRUCTION_EF: int = 200
+    HNSW_SEARCH_EF: int = 50
+    # How many vectors Chroma's HNSW segment buffers per insert batch and
+    # how many accumulate before it syncs the index to disk; larger values
+    # defer graph-rebuild and fsync work during bulk ingest
+    HNSW_BATCH_SIZE: int = 1000
+    HNSW_SYNC_THRESHOLD: int = 10000
+    # Chunks per collection.add() during ingest; per-call transaction and
+    # lock overhead amortizes up to roughly this size
+    CHROMA_BATCH: int = 250
+    # Chunker shape: window size in characters and how much trailing text
+    # carries into the next chunk to keep sentences intact across edges
+    CHUNK_SIZE: int = 1000
+    CHUNK_OVERLAP: int = 100
+    # Relax durability during re-runnable bulk ingestion (synchronous=OFF,
+    # no fsync); never enable for the serving database in production
+    BULK_INGEST: bool = False
     
     # Database Configuration
     DATABASE_URL: str = "sqlite:///./data/documents.db"
+
+    # Optional shared cache for multi-worker deployments; in-process caches
+    # are used when unset
+    REDIS_URL: Optional[str] = None
     
     # File Upload Configuration
     UPLOAD_DIRECTORY: str = "./data/uploads"
@@ -34,20 +77,23 @@ class Settings(BaseSettings):
     class Config:
         env_file = '.env'
         case_sensitive = True
+        # Settings never change after startup; freezing makes reads cheaper
+        # and catches accidental mutation
+        frozen = True
 
     def validate_api_key(self) -> bool:
         """Validate that the OpenAI API key is set and not empty."""
         return bool(self.OPENAI_API_KEY and self.OPENAI_API_KEY != 'your-api-key-here')
 
-@lru_cache()
+# Create global settings instance once at import; callers should import
+# `settings` directly rather than going through a cache lookup
+settings = Settings()
+
 def get_settings() -> Settings:
     """
-    Returns cached settings instance.
+    Returns the module-level settings instance (kept for dependency injection).
     """
-    return Settings()
-
-# Create global settings instance
-settings = get_settings()
+    return settings
 
 # Export settings
 __all__ = ['settings'] 
\ No newline at end of file
@@ -1,9 +1,9 @@
 import os
-import shutil
-import uuid
 import logging
+from functools import partial
 from pathlib import Path
 from typing import Tuple, Dict
+import anyio.to_thread
 from fastapi import UploadFile, HTTPException, status
 from src.core.config import settings
 from src.core.database import db_manager
@@ -11,51 +11,114 @@ from src.ingestion.ingest import process_single_document
 
 logger = logging.getLogger(__name__)
 
+# Frozen at import so the per-upload membership test is an O(1) hash lookup
+# instead of an O(N) list scan
+_ALLOWED_EXT = frozenset(ext.lower() for ext in settings.ALLOWED_FILE_TYPES)
+
 class DocumentService:
     """Service for managing document uploads and processing."""
-    
+
+    # Copy uploads in bounded chunks so a large file never sits fully in RAM;
+    # 1 MiB keeps the syscall count low without holding much memory
+    UPLOAD_CHUNK_SIZE = 1 << 20
+
+    # Directories already ensured this process; repeated instantiation
+    # (e.g. in tests) skips the stat+mkdir syscalls
+    _created_dirs = set()
+
     def __init__(self):
         self.upload_dir = Path(settings.UPLOAD_DIRECTORY)
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Document service initialized with upload directory: {self.upload_dir}")
+        if str(self.upload_dir) not in DocumentService._created_dirs:
+            self.upload_dir.mkdir(parents=True, exist_ok=True)
+            DocumentService._created_dirs.add(str(self.upload_dir))
+        logger.info("Document service initialized with upload directory: %s", self.upload_dir)
     
-    def validate_file(self, file: UploadFile) -> Tuple[bool, str]:
+    def validate_file(self, file: UploadFile, file_extension: str = None) -> Tuple[bool, str]:
         """Validate uploaded file."""
+        # Cheapest check first
+        if not file.filename:
+            return False, "Filename is required"
+
         # Check file size
         if file.size and file.size > settings.MAX_FILE_SIZE:
             return False, f"File size {file.size} exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
         
-        # Check file type
-        file_extension = Path(file.filename).suffix.lower()
-        if file_extension not in settings.ALLOWED_FILE_TYPES:
+        # Check file type (callers on the upload path pass the extension in
+        # so it is parsed once per request; os.path.splitext avoids the
+        # PurePath allocation of pathlib)
+        if file_extension is None:
+            file_extension = os.path.splitext(file.filename)[1].lower()
+        if file_extension not in _ALLOWED_EXT:
             return False, f"File type {file_extension} is not allowed. Allowed types: {', '.join(settings.ALLOWED_FILE_TYPES)}"
         
-        # Check if filename is provided
-        if not file.filename:
-            return False, "Filename is required"
-        
         return True, "File is valid"
     
-    def save_uploaded_file(self, file: UploadFile) -> str:
-        """Save uploaded file to disk."""
+    def save_uploaded_file(self, file: UploadFile, file_extension: str = None) -> Tuple[str, int]:
+        """Save uploaded file to disk, returning its path and size in bytes."""
         # Generate unique filename to avoid conflicts
         original_filename = file.filename
-        file_extension = Path(original_filename).suffix.lower()
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        if file_extension is None:
+            file_extension = os.path.splitext(original_filename)[1].lower()
+        # Same 128 bits of entropy as uuid4 without constructing and
+        # formatting a UUID object; also drops the hyphens from the name
+        unique_filename = f"{os.urandom(16).hex()}{file_extension}"
         
         # Create file path
         file_path = self.upload_dir / unique_filename
         
-        # Save file
+        # Save file, streaming in bounded chunks and enforcing the size limit
+        # as we go (file.size can be missing for chunked transfer encoding)
         try:
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            logger.info(f"Saved uploaded file: {original_filename} -> {file_path}")
-            return str(file_path)
-        
+            bytes_written = 0
+            with open(file_path, "wb", buffering=0) as buffer:
+                # Large uploads have already spilled Starlette's spooled file
+                # to disk, so the kernel can move the bytes directly without
+                # round-tripping through user space. Small uploads stay in
+                # memory (no fileno), so only attempt this past the spool size.
+                sent_via_kernel = False
+                if file.size and self.UPLOAD_CHUNK_SIZE < file.size <= settings.MAX_FILE_SIZE:
+                    try:
+                        out_fd = buffer.fileno()
+                        in_fd = file.file.fileno()
+                        while bytes_written < file.size:
+                            sent = os.sendfile(out_fd, in_fd, bytes_written,
+                                               file.size - bytes_written)
+                            if sent == 0:
+                                break
+                            bytes_written += sent
+                        sent_via_kernel = True
+                    except (AttributeError, OSError):
+                        bytes_written = 0
+                        buffer.seek(0)
+                        buffer.truncate()
+
+                if not sent_via_kernel:
+                    while True:
+                        chunk = file.file.read(self.UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        bytes_written += len(chunk)
+                        if bytes_written > settings.MAX_FILE_SIZE:
+                            raise HTTPException(
+                                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"File exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
+                            )
+                        buffer.write(chunk)
+
+                # One explicit fsync at the end instead of relying on
+                # close-time flushing
+                os.fsync(buffer.fileno())
+
+            logger.info("Saved uploaded file: %s -> %s", original_filename, file_path)
+            return str(file_path), bytes_written
+
+        except HTTPException:
+            # Remove the partial file before propagating the size error
+            if file_path.exists():
+                file_path.unlink()
+            raise
         except Exception as e:
-            logger.error(f"Error saving file {original_filename}: {str(e)}")
+            logger.error("Error saving file %s: %s", original_filename, str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to save file: {str(e)}"
@@ -74,22 +137,31 @@ class DocumentService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Title is required for document upload."
                 )
+            # Parse the extension once; validation, saving, and the DB row
+            # all reuse it
+            file_extension = os.path.splitext(file.filename or "")[1].lower()
+
             # Validate file
-            is_valid, error_message = self.validate_file(file)
+            is_valid, error_message = self.validate_file(file, file_extension)
             if not is_valid:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=error_message
                 )
             
-            # Save file
-            file_path = self.save_uploaded_file(file)
-            file_size = os.path.getsize(file_path)
-            file_extension = Path(file.filename).suffix.lower()
+            # Save file; the copy loop already counted the bytes, so no
+            # extra stat() is needed. The copy and the insert below run in
+            # worker threads so the event loop keeps serving other requests
+            # during a multi-MB upload.
+            file_path, file_size = await anyio.to_thread.run_sync(
+                self.save_uploaded_file, file, file_extension
+            )
             
-            # Add to database
-            document_id = db_manager.add_document(
-                filename=Path(file_path).name,
+            # Add to database; the insert returns the complete row, so no
+            # follow-up read is needed
+            document = await anyio.to_thread.run_sync(partial(
+                db_manager.add_document,
+                filename=os.path.basename(file_path),
                 original_filename=file.filename,
                 file_path=file_path,
                 file_size=file_size,
@@ -97,19 +169,19 @@ class DocumentService:
                 title=title,
                 description=description,
                 area=area
-            )
-            
-            # Get the created document
-            document = db_manager.get_document(document_id)
+            ))
+            document_id = document['id']
             
             # Process document for vector store (if supported file type)
             processing_result = None
             if file_extension in [".txt", ".md"]:  # Only process supported types
                 try:
-                    processing_result = process_single_document(file_path, document_id)
-                    logger.info(f"Vector processing result: {processing_result}")
+                    processing_result = await anyio.to_thread.run_sync(
+                        process_single_document, file_path, document_id
+                    )
+                    logger.info("Vector processing result: %s", processing_result)
                 except Exception as e:
-                    logger.error(f"Error processing document for vector store: {str(e)}")
+                    logger.error("Error processing document for vector store: %s", str(e))
                     processing_result = {
                         "status": "error", 
                         "message": f"Vector processing failed: {str(e)}"
@@ -138,12 +210,57 @@ class DocumentService:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in upload_document: {str(e)}")
+            logger.error("Unexpected error in upload_document: %s", str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Internal server error: {str(e)}"
             )
     
+    async def upload_documents_bulk(self, files, area: str = None):
+        """Upload several documents with a single database transaction.
+
+        Files are validated and saved individually, but the metadata rows
+        are inserted together via add_documents_bulk so N uploads cost one
+        commit fsync instead of N. Titles default to the original filename.
+        """
+        try:
+            rows = []
+            for file in files:
+                is_valid, error_message = self.validate_file(file)
+                if not is_valid:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"{file.filename}: {error_message}"
+                    )
+            for file in files:
+                file_extension = os.path.splitext(file.filename or "")[1].lower()
+                file_path, file_size = await anyio.to_thread.run_sync(
+                    self.save_uploaded_file, file, file_extension
+                )
+                rows.append({
+                    'filename': os.path.basename(file_path),
+                    'original_filename': file.filename,
+                    'file_path': file_path,
+                    'file_size': file_size,
+                    'file_type': file_extension,
+                    'title': file.filename,
+                    'area': area
+                })
+            ids = await anyio.to_thread.run_sync(db_manager.add_documents_bulk, rows)
+            return {
+                "status": "success",
+                "document_ids": ids,
+                "message": f"Uploaded {len(ids)} documents successfully"
+            }
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("Unexpected error in upload_documents_bulk: %s", str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
     def list_documents(self, limit: int = 100, offset: int = 0, area: str = None):
         """List documents with optional filtering."""
         try:
@@ -162,7 +279,7 @@ class DocumentService:
             }
             
         except Exception as e:
-            logger.error(f"Error listing documents: {str(e)}")
+            logger.error("Error listing documents: %s", str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error listing documents: {str(e)}"
@@ -190,7 +307,7 @@ class DocumentService:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error getting document {document_id}: {str(e)}")
+            logger.error("Error getting document %s: %s", document_id, str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error getting document: {str(e)}"
@@ -199,21 +316,13 @@ class DocumentService:
     def delete_document(self, document_id: int):
         """Delete a document (soft delete)."""
         try:
-            # Check if document exists
-            document = db_manager.get_document(document_id)
-            if not document:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Document with ID {document_id} not found"
-                )
-            
-            # Soft delete document
+            # A single atomic UPDATE doubles as the existence check: no row
+            # updated means the document was missing or already deleted
             success = db_manager.delete_document(document_id)
-            
             if not success:
                 raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to delete document"
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Document with ID {document_id} not found"
                 )
             
             return {
@@ -224,7 +333,7 @@ class DocumentService:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error deleting document {document_id}: {str(e)}")
+            logger.error("Error deleting document %s: %s", document_id, str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error deleting document: {str(e)}"
@@ -240,7 +349,7 @@ class DocumentService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting document stats: {str(e)}")
+            logger.error("Error getting document stats: %s", str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error getting document stats: {str(e)}"
@@ -249,26 +358,25 @@ class DocumentService:
     def update_document(self, document_id: int, title: str = None, description: str = None, area: str = None):
         """Update document metadata."""
         try:
-            # Check if document exists
-            document = db_manager.get_document(document_id)
-            if not document:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Document with ID {document_id} not found"
-                )
             # Validate area (should not be empty)
             if area is not None and (not area or area.strip() == ""):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Area/Category is required."
                 )
-            success = db_manager.update_document(document_id, title=title, description=description, area=area)
-            if not success:
+            if title is None and description is None and area is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Failed to update document metadata."
                 )
-            updated_doc = db_manager.get_document(document_id)
+            # The UPDATE ... RETURNING statement is the existence check, the
+            # write, and the re-read in one round-trip
+            updated_doc = db_manager.update_document(document_id, title=title, description=description, area=area)
+            if updated_doc is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Document with ID {document_id} not found"
+                )
             return {
                 "status": "success",
                 "document": updated_doc,
@@ -277,7 +385,7 @@ class DocumentService:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating document {document_id}: {str(e)}")
+            logger.error("Error updating document %s: %s", document_id, str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error updating document: {str(e)}"
@@ -0,0 +1,112 @@
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import orjson
+
+from src.core.config import settings
+
+# FAISS is an optional backend for write-heavy ingestion: Chroma re-pickles
+# state on write so insert time grows super-linearly with corpus size,
+# while FAISS appends vectors to a flat file with no per-add transaction
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+class FaissStore:
+    """FAISS-backed vector store with a JSONL metadata side-car.
+
+    Vectors live in an HNSW index persisted as one flat file (memory-mapped
+    on load, so startup does not copy the index through the heap); chunk
+    text and metadata live in an append-only JSONL file whose line number
+    is the FAISS row id. Rows are L2-normalized at insert so inner product
+    equals cosine similarity.
+    """
+
+    HNSW_M = 32
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or settings.FAISS_PERSIST_DIRECTORY)
+        self.index_path = self.directory / "index.faiss"
+        self.sidecar_path = self.directory / "metadata.jsonl"
+        self._lock = threading.Lock()
+        self._index = None
+        self._records: Optional[List[Dict]] = None
+
+    def _require_faiss(self):
+        if not HAS_FAISS:
+            raise RuntimeError(
+                "VECTOR_BACKEND is 'faiss' but the faiss package is not "
+                "installed (pip install faiss-cpu)")
+
+    def _load(self, dim: int):
+        """Load or create the index and side-car. Caller must hold the lock."""
+        if self._index is not None:
+            return
+        self._require_faiss()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.index_path.exists():
+            self._index = faiss.read_index(str(self.index_path),
+                                           faiss.IO_FLAG_MMAP)
+            with open(self.sidecar_path, "rb") as f:
+                self._records = [orjson.loads(line) for line in f if line.strip()]
+        else:
+            self._index = faiss.IndexHNSWFlat(dim, self.HNSW_M,
+                                              faiss.METRIC_INNER_PRODUCT)
+            self._records = []
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def add(self, embeddings, documents: List[str],
+            metadatas: List[Dict], ids: List[str]):
+        """Append a batch of vectors and their side-car records."""
+        matrix = self._normalize(embeddings)
+        with self._lock:
+            self._load(matrix.shape[1])
+            self._index.add(matrix)
+            lines = []
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                record = {"id": doc_id, "content": document,
+                          "metadata": metadata}
+                self._records.append(record)
+                lines.append(orjson.dumps(record))
+            with open(self.sidecar_path, "ab") as f:
+                f.write(b"\n".join(lines) + b"\n")
+            faiss.write_index(self._index, str(self.index_path))
+
+    def count(self) -> int:
+        with self._lock:
+            if self._index is None and not self.index_path.exists():
+                return 0
+            self._load(1)
+            return self._index.ntotal
+
+    def search(self, query_vector, n_results: int = 5) -> List[Dict]:
+        """Return the n_results nearest chunks as content/metadata/score dicts."""
+        query = self._normalize(np.atleast_2d(query_vector))
+        with self._lock:
+            if self._index is None and not self.index_path.exists():
+                return []
+            self._load(query.shape[1])
+            scores, indices = self._index.search(query, n_results)
+        results = []
+        for score, row in zip(scores[0], indices[0]):
+            if row < 0:
+                continue
+            record = self._records[row]
+            results.append({
+                "content": record["content"],
+                "metadata": record["metadata"],
+                "relevance_score": float(score),
+            })
+        return results
+
+# Shared instance; only touched when settings.VECTOR_BACKEND == "faiss"
+faiss_store = FaissStore()
@@ -0,0 +1,233 @@
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import orjson
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Numba is an optional accelerator: when available, the similarity scan is a
+# JIT-compiled parallel loop; otherwise we fall back to numpy's matmul
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _similarity_scores(matrix, query):
+        n, dim = matrix.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(dim):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+
+    # Warm up the JIT once at import so the first request isn't delayed
+    # by compilation (cache=True keeps the compiled kernel across restarts)
+    _similarity_scores(np.zeros((1, 4), dtype=np.float32),
+                       np.zeros(4, dtype=np.float32))
+else:
+    def _similarity_scores(matrix, query):
+        return matrix @ query
+
+class SemanticCache:
+    """In-process similarity cache for RAG responses keyed by query embedding.
+
+    Chat traffic repeats heavily: users ask the same question in slightly
+    different words. Instead of re-running the full RAG pipeline (embedding +
+    vector search + LLM call) for every paraphrase, we embed the incoming
+    query, compare it against the embeddings of recently answered queries with
+    a single vectorized dot product, and return the cached answer when the
+    cosine similarity clears the threshold.
+
+    Embeddings are L2-normalized at insert time so cosine similarity reduces
+    to a dot product, and they are kept in one contiguous numpy matrix so the
+    whole cache is scanned in a single BLAS call.
+    """
+
+    def __init__(self,
+                 similarity_threshold: float = 0.97,
+                 max_entries: int = 1024,
+                 ttl_seconds: float = 3600.0,
+                 max_exact_entries: int = 4096):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_exact_entries = max_exact_entries
+        self._lock = threading.Lock()
+        self._embeddings: Optional[np.ndarray] = None  # (n, dim), normalized rows
+        self._responses = []
+        self._expiries = []
+        # Exact-match LRU keyed by normalized question text; consulted before
+        # the embedding step so verbatim repeats are an O(1) dict lookup
+        self._exact: OrderedDict = OrderedDict()
+        self._embedder = None
+        # Shared Redis cache (if configured) so hits are visible to every
+        # uvicorn worker instead of fragmenting per process
+        self._redis = None
+        self._redis_checked = False
+
+    def _get_redis(self):
+        """Return the shared Redis client, or None when not configured/reachable."""
+        if not self._redis_checked:
+            self._redis_checked = True
+            if settings.REDIS_URL:
+                try:
+                    import redis
+                    client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=False)
+                    client.ping()
+                    self._redis = client
+                except Exception as e:
+                    logger.warning("Redis cache unavailable, using in-process caches only: %s", str(e))
+        return self._redis
+
+    @staticmethod
+    def _redis_key(exact_key: str) -> bytes:
+        return b"chat:" + hashlib.sha256(exact_key.encode("utf-8")).digest()
+
+    def _redis_lookup(self, exact_key: str) -> Optional[Dict]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            cached = client.get(self._redis_key(exact_key))
+            if cached is not None:
+                logger.info("Redis cache hit for chat query")
+                return orjson.loads(cached)
+        except Exception as e:
+            logger.warning("Redis lookup failed: %s", str(e))
+        return None
+
+    def _redis_insert(self, exact_key: str, response: Dict):
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.set(self._redis_key(exact_key), orjson.dumps(response),
+                       ex=int(self.ttl_seconds))
+        except Exception as e:
+            logger.warning("Redis insert failed: %s", str(e))
+
+    def _embed(self, query: str) -> np.ndarray:
+        """Embed a query with the same default embedder ChromaDB uses."""
+        if self._embedder is None:
+            from chromadb.utils import embedding_functions
+            self._embedder = embedding_functions.DefaultEmbeddingFunction()
+        vector = np.asarray(self._embedder([query])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _evict_expired(self, now: float):
+        """Drop expired entries. Caller must hold the lock."""
+        if self._embeddings is None:
+            return
+        alive = [i for i, expiry in enumerate(self._expiries) if expiry > now]
+        if len(alive) == len(self._expiries):
+            return
+        if not alive:
+            self._embeddings = None
+            self._responses = []
+            self._expiries = []
+        else:
+            self._embeddings = self._embeddings[alive]
+            self._responses = [self._responses[i] for i in alive]
+            self._expiries = [self._expiries[i] for i in alive]
+
+    def _find(self, vector: np.ndarray) -> Optional[Dict]:
+        """Return the cached response most similar to vector, if close enough."""
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            if self._embeddings is None:
+                return None
+            similarities = _similarity_scores(self._embeddings, vector)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.similarity_threshold:
+                logger.info("Semantic cache hit (similarity: %.3f)", similarities[best])
+                return dict(self._responses[best])
+            return None
+
+    def _insert(self, vector: np.ndarray, response: Dict):
+        """Insert a response, evicting the oldest entry when full."""
+        with self._lock:
+            row = vector.reshape(1, -1)
+            if self._embeddings is None:
+                self._embeddings = row
+            else:
+                self._embeddings = np.vstack([self._embeddings, row])
+            self._responses.append(dict(response))
+            self._expiries.append(time.monotonic() + self.ttl_seconds)
+            if len(self._responses) > self.max_entries:
+                self._embeddings = self._embeddings[1:]
+                self._responses.pop(0)
+                self._expiries.pop(0)
+
+    def _exact_lookup(self, key: str) -> Optional[Dict]:
+        """O(1) exact-match lookup by normalized question text."""
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is None:
+                return None
+            response, expiry = entry
+            if expiry <= time.monotonic():
+                del self._exact[key]
+                return None
+            self._exact.move_to_end(key)
+            logger.info("Exact cache hit for chat query")
+            return dict(response)
+
+    def _exact_insert(self, key: str, response: Dict):
+        """Insert into the exact-match LRU, evicting the least recent entry."""
+        with self._lock:
+            self._exact[key] = (dict(response), time.monotonic() + self.ttl_seconds)
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.max_exact_entries:
+                self._exact.popitem(last=False)
+
+    def get_or_compute(self, query: str, compute: Callable[[str], Dict]) -> Dict:
+        """Return a cached response for query, or compute and cache one.
+
+        Verbatim repeats are served from the exact-match LRU before any
+        embedding work; only successful responses are cached so transient
+        errors are retried.
+        """
+        exact_key = query.strip().lower()
+        cached = self._exact_lookup(exact_key)
+        if cached is not None:
+            return cached
+
+        cached = self._redis_lookup(exact_key)
+        if cached is not None:
+            self._exact_insert(exact_key, cached)
+            return cached
+
+        try:
+            vector = self._embed(query)
+        except Exception as e:
+            # If embedding fails, fall through to the uncached path
+            logger.error("Error embedding query for semantic cache: %s", str(e))
+            return compute(query)
+
+        cached = self._find(vector)
+        if cached is not None:
+            self._exact_insert(exact_key, cached)
+            return cached
+
+        result = compute(query)
+        if result.get("status") == "success":
+            self._insert(vector, result)
+            self._exact_insert(exact_key, result)
+            self._redis_insert(exact_key, result)
+        return result
+
+# Global semantic cache instance
+semantic_cache = SemanticCache()
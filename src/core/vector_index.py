@@ -0,0 +1,182 @@
+import os
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import chromadb
+import numpy as np
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# LRU of normalized query embeddings: repeated or re-phrased-identical
+# queries skip the sentence-transformer forward pass entirely. Reached
+# from the request thread pool, so all access happens under the lock.
+_query_embedding_cache: OrderedDict = OrderedDict()
+_query_embedding_cache_lock = threading.Lock()
+_QUERY_EMBEDDING_CACHE_MAX = 1024
+
+def _embed_queries_cached(query_texts: List[str]) -> np.ndarray:
+    """Embed queries, serving repeats from the LRU; returns normalized rows."""
+    from src.ingestion.ingest import get_embedder
+    keys = [query.strip().lower() for query in query_texts]
+    # Copy hit vectors out while holding the lock so a concurrent batch's
+    # eviction cannot pull an entry out from under this one
+    found: Dict[str, np.ndarray] = {}
+    with _query_embedding_cache_lock:
+        for key in keys:
+            vector = _query_embedding_cache.get(key)
+            if vector is not None:
+                _query_embedding_cache.move_to_end(key)
+                found[key] = vector
+    missing = [i for i, key in enumerate(keys) if key not in found]
+    if missing:
+        # One forward pass covers every cache miss in the batch; the model
+        # runs outside the lock so concurrent requests are not serialized
+        vectors = np.asarray(get_embedder()([query_texts[i] for i in missing]),
+                             dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        with _query_embedding_cache_lock:
+            for i, vector in zip(missing, vectors):
+                vector.setflags(write=False)
+                _query_embedding_cache[keys[i]] = vector
+                found[keys[i]] = vector
+            while len(_query_embedding_cache) > _QUERY_EMBEDDING_CACHE_MAX:
+                _query_embedding_cache.popitem(last=False)
+    return np.stack([found[key] for key in keys])
+
+class VectorIndex:
+    """Brute-force in-memory vector search over a Chroma collection.
+
+    At this project's scale a single `matrix @ query` call over a contiguous
+    matrix beats Chroma's HNSW traversal plus its Python-boundary overhead.
+    Chroma stays the source of truth; this index mirrors the collection's
+    embeddings, L2-normalizes them and quantizes each row to int8 with a
+    per-row scale (4x smaller than float32, so the scan stays in cache and
+    memory bandwidth goes further). The quantized matrix is persisted as an
+    .npy file and memory-mapped on load so workers share pages, and the
+    index rebuilds itself whenever the collection count changes.
+    """
+
+    def __init__(self, collection_name: str = "documents"):
+        self.collection_name = collection_name
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None  # (n, dim), int8 quantized rows
+        self._scales: Optional[np.ndarray] = None  # (n,), float32 per-row scales
+        self._documents: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._count = -1
+        self._client = None
+        persist_dir = Path(settings.CHROMA_PERSIST_DIRECTORY)
+        self._matrix_path = persist_dir / f"{collection_name}_vectors_int8.npy"
+        self._scales_path = persist_dir / f"{collection_name}_scales.npy"
+
+    @staticmethod
+    def _quantize(matrix: np.ndarray):
+        """Symmetric per-row int8 quantization: returns (int8 matrix, scales)."""
+        scales = np.abs(matrix).max(axis=-1) / 127.0
+        scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+        quantized = np.round(matrix / scales[..., None]).astype(np.int8)
+        return quantized, scales
+
+    def _get_collection(self):
+        if self._client is None:
+            os.makedirs(settings.CHROMA_PERSIST_DIRECTORY, exist_ok=True)
+            self._client = chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIRECTORY)
+        return self._client.get_collection(self.collection_name)
+
+    def _refresh(self, collection):
+        """Rebuild the matrix if the collection changed. Caller holds the lock."""
+        count = collection.count()
+        if count == self._count and self._matrix is not None:
+            return
+        if count == 0:
+            self._matrix = None
+            self._scales = None
+            self._documents = []
+            self._metadatas = []
+            self._count = 0
+            return
+
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        matrix = np.asarray(data["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix, scales = self._quantize(matrix / norms)
+
+        # Persist and mmap so the matrix lives in the page cache, shared
+        # across workers instead of copied per process
+        try:
+            np.save(self._matrix_path, matrix)
+            np.save(self._scales_path, scales)
+            matrix = np.load(self._matrix_path, mmap_mode="r")
+        except OSError as e:
+            logger.warning("Could not persist vector index, keeping in RAM: %s", str(e))
+
+        self._matrix = matrix
+        self._scales = scales
+        self._documents = data["documents"]
+        self._metadatas = data["metadatas"]
+        self._count = count
+        logger.info("Vector index refreshed: %s vectors", count)
+
+    def query(self, query_text: str, n_results: int = 5) -> List[Dict]:
+        """Return the top n_results chunks for query_text by cosine similarity."""
+        return self.query_batch([query_text], n_results=n_results)[0]
+
+    def query_batch(self, query_texts: List[str], n_results: int = 5) -> List[List[Dict]]:
+        """Return top n_results chunks for each query in one pass.
+
+        All queries share a single embedder forward pass and one matmul
+        against the document matrix, so N queries cost barely more than one.
+        When VECTOR_BACKEND is faiss, retrieval goes to the FAISS store
+        instead, mirroring where ingestion wrote the vectors.
+        """
+        if settings.VECTOR_BACKEND == "faiss":
+            # Lazy import: faiss_store pulls in the optional faiss package
+            from src.core.faiss_store import faiss_store
+            queries = _embed_queries_cached(query_texts)
+            return [faiss_store.search(query, n_results=n_results)
+                    for query in queries]
+
+        collection = self._get_collection()
+        with self._lock:
+            self._refresh(collection)
+            matrix = self._matrix
+            scales = self._scales
+            documents = self._documents
+            metadatas = self._metadatas
+
+        if matrix is None:
+            return [[] for _ in query_texts]
+
+        # Embeddings come pre-normalized from the per-query LRU; only cache
+        # misses hit the model, and those share one forward pass
+        queries = _embed_queries_cached(query_texts)
+
+        # int8 x int8 dot products with int32 accumulation, then rescale;
+        # cosine top-k under symmetric quantization loses <1% accuracy
+        query_quantized, query_scales = self._quantize(queries)
+        raw = np.matmul(matrix, query_quantized.T, dtype=np.int32)  # (n, m)
+        scores = raw.astype(np.float32) * (scales[:, None] * query_scales[None, :])
+
+        results = []
+        for j in range(scores.shape[1]):
+            column = scores[:, j]
+            k = min(n_results, len(column))
+            top = np.argpartition(column, -k)[-k:]
+            top = top[np.argsort(column[top])[::-1]]
+            results.append([{
+                "content": documents[i],
+                "metadata": metadatas[i],
+                "relevance_score": float(column[i])
+            } for i in top])
+        return results
+
+# Global vector index instance
+vector_index = VectorIndex()